@@ -3,23 +3,19 @@ Configuration management with environment variable sanitization
 """
 
 import os
-import re
 from typing import Optional, List
 from pydantic_settings import BaseSettings
 
+from app.utils.data_sanitizer import clean_value
+
 
 def sanitize_env_var(value: str) -> str:
     """Remove null bytes and other problematic characters from environment variables"""
     if not value:
         return value
     
-    # Remove null bytes and other control characters
-    sanitized = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', value)
-    
-    # Remove Unicode escape sequences that might cause issues
-    sanitized = re.sub(r'\\u0000', '', sanitized)
-    
-    return sanitized.strip()
+    # Remove null bytes, other control characters and \u0000 escapes
+    return clean_value(value)
 
 
 class Settings(BaseSettings):
@@ -3,10 +3,15 @@ Database configuration and connection management
 """
 
 import os
-from sqlalchemy import create_engine, MetaData
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String, select, delete, insert, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateTable
 import logging
 
 logger = logging.getLogger(__name__)
@@ -68,6 +73,14 @@ Base = declarative_base()
 # Metadata for migrations
 metadata = MetaData()
 
+# Hash of the last schema applied by init_db(), kept outside Base.metadata
+schema_meta = Table(
+    "schema_meta",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("schema_hash", String(64), nullable=False),
+)
+
 def get_db():
     """Get database session"""
     db = SessionLocal()
@@ -82,48 +95,86 @@ def init_db():
         # Import all models to ensure they're registered
         from app.models import user, card, collection, scan_analytics, moderation
         
+        # Skip table creation when the schema matches the last one applied
+        schema_hash = get_schema_hash()
+        if get_stored_schema_hash() == schema_hash:
+            logger.info("Database schema unchanged, skipping table creation")
+            return
+        
         # Create all tables
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
         
         # Create indexes for PostgreSQL
-        if USE_POSTGRESQL:
-            create_indexes()
+        if USE_POSTGRESQL and not create_indexes():
+            # Leave the hash unstored so the next startup retries
+            return
+        
+        store_schema_hash(schema_hash)
             
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
 
-def create_indexes():
-    """Create database indexes for performance"""
+def get_schema_hash() -> str:
+    """Get a hash of the DDL for all registered tables"""
+    ddl = sorted(
+        str(CreateTable(table).compile(engine))
+        for table in Base.metadata.tables.values()
+    )
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()
+
+def get_stored_schema_hash() -> Optional[str]:
+    """Get the schema hash recorded by the last successful init_db()"""
     try:
         with engine.connect() as conn:
+            return conn.execute(select(schema_meta.c.schema_hash)).scalar()
+    except SQLAlchemyError:
+        # Table missing on a fresh database
+        return None
+
+def store_schema_hash(schema_hash: str):
+    """Record the applied schema hash"""
+    try:
+        schema_meta.create(bind=engine, checkfirst=True)
+        with engine.begin() as conn:
+            conn.execute(delete(schema_meta))
+            conn.execute(insert(schema_meta).values(id=1, schema_hash=schema_hash))
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to store schema hash: {e}")
+
+def create_indexes() -> bool:
+    """Create database indexes for performance, returning whether they were all created"""
+    try:
+        with engine.begin() as conn:
             # User indexes
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_users_firebase_uid ON users(firebase_uid)")
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_users_firebase_uid ON users(firebase_uid)"))
             
             # Card indexes
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_cards_name ON cards(name)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_cards_set ON cards(set_name)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_cards_rarity ON cards(rarity)")
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_cards_name ON cards(name)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_cards_set ON cards(set_name)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_cards_rarity ON cards(rarity)"))
             
             # Collection indexes
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_collections_user_id ON collections(user_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_collections_card_id ON collections(card_id)")
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_collections_owner_id ON collections(owner_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_collection_cards_card_id ON collection_cards(card_id)"))
             
             # Analytics indexes
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_analytics_user_id ON scan_analytics(user_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_analytics_created_at ON scan_analytics(created_at)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_analytics_model_version ON scan_analytics(model_version)")
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_scan_analytics_user_id ON scan_analytics(user_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_scan_analytics_created_at ON scan_analytics(created_at)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_scan_analytics_model_version ON scan_analytics(model_version)"))
             
             # Moderation indexes
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_moderation_reports_user_id ON moderation_reports(user_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_moderation_reports_status ON moderation_reports(status)")
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_moderation_queue_reporter_id ON moderation_queue(reporter_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_moderation_queue_status ON moderation_queue(status)"))
             
         logger.info("Database indexes created successfully")
+        return True
         
     except Exception as e:
         logger.error(f"Failed to create indexes: {e}")
+        return False
 
 def get_database_info():
     """Get database information"""
@@ -134,6 +185,29 @@ def get_database_info():
         "max_overflow": engine.pool.overflow() if hasattr(engine.pool, 'overflow') else "N/A"
     }
 
+def warm_pool() -> int:
+    """Open the pool's connections up front so early requests skip the connect handshake"""
+    if not hasattr(engine.pool, "size"):
+        return 0
+    
+    size = engine.pool.size()
+    connections = []
+    # Hold every connection open at once so the pool creates `size` distinct ones
+    with ThreadPoolExecutor(max_workers=size) as executor:
+        futures = [executor.submit(engine.connect) for _ in range(size)]
+    
+    # Collect per future so one failed connect does not strand the others checked out
+    for future in futures:
+        try:
+            connections.append(future.result())
+        except Exception as e:
+            logger.warning(f"Connection pool warm-up failed: {e}")
+    
+    for conn in connections:
+        conn.close()
+    
+    return len(connections)
+
 def health_check():
     """Check database health"""
     try:
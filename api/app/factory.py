@@ -0,0 +1,269 @@
+"""
+Application factory for the Scanémon API
+
+create_app(profile) builds the application for one of two profiles:
+- full: all API routers, security middleware and database startup
+- minimal: root and health endpoints only, without external dependencies (Railway)
+"""
+
+import os
+import json
+import asyncio
+import time
+import importlib
+from datetime import datetime
+from contextlib import asynccontextmanager
+from typing import Dict, Any
+
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+
+# Routers per profile, imported lazily in create_app() so only the
+# selected profile pays their import cost
+# (module path, prefix, tag)
+ROUTERS = {
+    "full": [
+        ("app.routes.auth", "/api/v1/auth", "Authentication"),
+        ("app.routes.cards", "/api/v1/cards", "Cards"),
+        ("app.routes.scan", "/api/v1/scan", "Scanning"),
+        ("app.routes.collection", "/api/v1/collection", "Collection"),
+        ("app.routes.analytics", "/api/v1/analytics", "Analytics"),
+        ("app.routes.moderation", "/api/v1/moderation", "Moderation"),
+        ("app.routes.monitoring", "/api/v1/monitoring", "Monitoring"),
+        ("app.routes.subscriptions", "/api/v1", "Subscriptions"),
+        ("app.routes.users", "/api/v1/users", "Users"),
+    ],
+    "minimal": [],
+}
+
+# Endpoints advertised by the full profile's root endpoint
+FULL_ENDPOINTS = {
+    "auth": "/api/v1/auth",
+    "cards": "/api/v1/cards",
+    "scan": "/api/v1/scan",
+    "collection": "/api/v1/collection",
+    "analytics": "/api/v1/analytics",
+    "moderation": "/api/v1/moderation",
+    "monitoring": "/api/v1/monitoring"
+}
+
+HEALTH_BODY_TEMPLATE = json.dumps({
+    "status": "healthy",
+    "version": "1.0.0",
+    "timestamp": "__TS__",
+    "message": "Scanémon API is running"
+}, ensure_ascii=False).encode()
+
+# Health body cached at one-second granularity
+_health_cache = {"sec": 0, "body": b""}
+
+
+def get_health_body() -> bytes:
+    """Get the health response body, rebuilding it at most once per second"""
+    now = int(time.time())
+    if now != _health_cache["sec"]:
+        timestamp = datetime.utcfromtimestamp(now).isoformat() + "Z"
+        _health_cache["body"] = HEALTH_BODY_TEMPLATE.replace(b"__TS__", timestamp.encode())
+        _health_cache["sec"] = now
+    return _health_cache["body"]
+
+
+class MinimalSettings:
+    """Settings for the minimal profile, read straight from the environment"""
+    API_HOST = os.getenv("API_HOST", "0.0.0.0")
+    API_PORT = int(os.getenv("API_PORT", "8000"))
+    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+    ENABLE_SWAGGER = True
+    ENABLE_CORS = True
+    CORS_ORIGINS = ["*"]  # Allow all origins for now
+
+
+def get_settings(profile: str = "full"):
+    """Get the settings object for a profile"""
+    if profile == "minimal":
+        return MinimalSettings()
+    
+    from app.core.config import settings
+    return settings
+
+
+@asynccontextmanager
+async def full_lifespan(app: FastAPI):
+    """Application lifespan events for the full profile"""
+    from app.core.database import init_db, warm_pool
+    from app.utils.data_sanitizer import sanitize_startup_environment
+    
+    logger = app.state.logger
+    
+    # Startup
+    logger.info("Starting Scanémon API...")
+    
+    # CRITICAL: Sanitize environment variables at startup
+    logger.info("🧹 Sanitizing environment variables at startup...")
+    # (skipped when a Railway startup script already did it)
+    cleaned_count = sanitize_startup_environment()
+    if cleaned_count > 0:
+        logger.warning(f"Sanitized {cleaned_count} environment variables at startup")
+    
+    # Initialize database
+    try:
+        # Import models to ensure they are registered with SQLAlchemy
+        importlib.import_module("app.models")
+        importlib.import_module("app.models.moderation")
+        init_db()
+        logger.info("Database initialized successfully")
+        
+        # Pre-open pooled connections off the event loop
+        warmed = await asyncio.to_thread(warm_pool)
+        logger.info(f"Warmed {warmed} database connections")
+    except Exception as e:
+        logger.error(f"Failed to initialize database: {e}")
+    
+    yield
+    
+    # Shutdown
+    logger.info("Shutting down Scanémon API...")
+
+
+@asynccontextmanager
+async def minimal_lifespan(app: FastAPI):
+    """Application lifespan events for the minimal profile"""
+    print("Starting Scanémon API...")
+    yield
+    print("Shutting down Scanémon API...")
+
+
+def setup_full_middleware(app: FastAPI) -> None:
+    """Setup logging, security, sanitization and rate limiting for the full profile"""
+    from slowapi import Limiter, _rate_limit_exceeded_handler
+    from slowapi.util import get_remote_address
+    from slowapi.errors import RateLimitExceeded
+    from app.core.logging import setup_logging
+    from app.middleware.security import setup_security_middleware
+    from app.middleware.data_sanitization import setup_data_sanitization_middleware
+    
+    # Setup logging
+    app.state.logger = setup_logging()
+    
+    # Setup security middleware
+    setup_security_middleware(app)
+    
+    # Setup data sanitization middleware
+    setup_data_sanitization_middleware(app)
+    
+    # Compress JSON responses; small bodies such as /health stay uncompressed
+    app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+    
+    # Add rate limiting (legacy support)
+    app.state.limiter = Limiter(key_func=get_remote_address)
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+
+async def http_exception_handler(request, exc: HTTPException):
+    """Handle HTTP exceptions"""
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail}
+    )
+
+
+async def general_exception_handler(request, exc: Exception):
+    """Handle general exceptions"""
+    return ORJSONResponse(
+        status_code=500,
+        content={"detail": "Internal server error"}
+    )
+
+
+def create_app(profile: str = "full") -> FastAPI:
+    """Create and configure the FastAPI application for a profile"""
+    if profile not in ROUTERS:
+        raise ValueError(f"Unknown profile: {profile}")
+    
+    settings = get_settings(profile)
+    full = profile == "full"
+    
+    app = FastAPI(
+        title="Scanémon API",
+        description="AI-powered Pokémon card scanner and collector API",
+        version="1.0.0",
+        docs_url="/docs" if settings.ENABLE_SWAGGER else None,
+        redoc_url="/redoc" if settings.ENABLE_SWAGGER else None,
+        lifespan=full_lifespan if full else minimal_lifespan,
+        default_response_class=ORJSONResponse
+    )
+    
+    if full:
+        setup_full_middleware(app)
+    elif settings.ENABLE_CORS:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=settings.CORS_ORIGINS,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+    
+    # Include routers
+    for module_path, prefix, tag in ROUTERS[profile]:
+        module = importlib.import_module(module_path)
+        app.include_router(module.router, prefix=prefix, tags=[tag])
+    
+    # Static root body, serialized once per app
+    root_info: Dict[str, Any] = {
+        "message": "Welcome to Scanémon API! 🎴",
+        "version": "1.0.0",
+        "status": "running",
+        "docs": "/docs" if settings.ENABLE_SWAGGER else "disabled",
+    }
+    if full:
+        root_info["endpoints"] = FULL_ENDPOINTS
+    else:
+        root_info["health"] = "/health"
+    root_body = json.dumps(root_info, ensure_ascii=False).encode()
+    
+    @app.get("/")
+    async def root() -> Response:
+        """Root endpoint with API information"""
+        return Response(content=root_body, media_type="application/json")
+    
+    @app.get("/health")
+    async def health_check() -> Response:
+        """Simple health check endpoint for Railway"""
+        try:
+            # Basic health check without external dependencies
+            return Response(content=get_health_body(), media_type="application/json")
+        except Exception as e:
+            return ORJSONResponse(content={
+                "status": "unhealthy",
+                "version": "1.0.0",
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "error": str(e)
+            })
+    
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    app.add_exception_handler(Exception, general_exception_handler)
+    
+    return app
+
+
+def run(app_path: str = "main:app", profile: str = "full") -> None:
+    """Serve the application with uvicorn"""
+    import sys
+    import uvicorn
+    
+    settings = get_settings(profile)
+    uvicorn.run(
+        app_path,
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        reload=settings.DEBUG,
+        log_level="info",
+        # uvloop is not available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1"))
+    )
+
@@ -10,12 +10,45 @@ from fastapi.responses import JSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from starlette.datastructures import Headers
+from functools import lru_cache
+from typing import Optional, Tuple
 import time
 import os
 
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+
+class CachedPreflightCORSMiddleware(CORSMiddleware):
+    """CORS middleware that reuses preflight results for repeated origin/method/headers
+    
+    Only the status, body and raw headers are cached; each request gets a fresh
+    Response, since outer middleware adds headers to the response it is handed.
+    """
+    
+    def __init__(self, app, preflight_cache_size: int = 1024, **kwargs):
+        super().__init__(app, **kwargs)
+        self._cached_preflight = lru_cache(maxsize=preflight_cache_size)(self._build_preflight)
+    
+    def _build_preflight(self, origin: str, method: str,
+                         requested_headers: Optional[str]) -> Tuple[int, bytes, Tuple[Tuple[bytes, bytes], ...]]:
+        headers = {"origin": origin, "access-control-request-method": method}
+        if requested_headers is not None:
+            headers["access-control-request-headers"] = requested_headers
+        response = super().preflight_response(request_headers=Headers(headers))
+        return response.status_code, response.body, tuple(response.raw_headers)
+    
+    def preflight_response(self, request_headers: Headers) -> Response:
+        status_code, body, raw_headers = self._cached_preflight(
+            request_headers["origin"],
+            request_headers["access-control-request-method"],
+            request_headers.get("access-control-request-headers"),
+        )
+        response = Response(content=body, status_code=status_code)
+        response.raw_headers = list(raw_headers)
+        return response
+
 def setup_security_middleware(app: FastAPI) -> None:
     """Setup comprehensive security middleware"""
     
@@ -25,7 +58,7 @@ def setup_security_middleware(app: FastAPI) -> None:
     
     # CORS configuration
     app.add_middleware(
-        CORSMiddleware,
+        CachedPreflightCORSMiddleware,
         allow_origins=[
             "https://scanemon-16c6c.web.app",
             "https://scanemon-16c6c.firebaseapp.com",
@@ -27,7 +27,7 @@ class CacheService:
         
         if REDIS_AVAILABLE:
             try:
-                self.redis_client = redis.from_url(redis_url)
+                self.redis_client = redis.from_url(redis_url, socket_keepalive=True)
                 # Test connection
                 self.redis_client.ping()
                 self.use_redis = True
@@ -252,6 +252,7 @@ def health_check() -> bool:
     """Check cache health"""
     try:
         if cache_service.use_redis and cache_service.redis_client:
+            # Shared client; its connection pool reconnects on the next command after a failure
             cache_service.redis_client.ping()
             return True
         else:
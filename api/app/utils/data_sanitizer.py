@@ -8,6 +8,37 @@ from typing import Any, Dict, List, Union, Optional
 
 logger = logging.getLogger(__name__)
 
+# Control characters removed from strings: everything below 0x20 except
+# tab, newline and carriage return, plus DEL
+CONTROL_CHARACTERS = frozenset(map(chr, [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F]))
+_CONTROL_TABLE = dict.fromkeys(map(ord, CONTROL_CHARACTERS))
+
+# Literal Unicode escape sequences such as \u0000
+_UNICODE_ESCAPE_RE = re.compile(r'\\u[0-9a-fA-F]{4}')
+
+# Set once the startup environment is clean so chained scripts skip the pass
+SANITIZED_FLAG = 'RAILWAY_ENV_SANITIZED'
+
+
+def strip_control(value: str) -> str:
+    """Remove control characters and surrounding whitespace, returning clean strings unchanged"""
+    if not value:
+        return value
+    
+    if not CONTROL_CHARACTERS.isdisjoint(value):
+        value = value.translate(_CONTROL_TABLE)
+    
+    # strip() hands back the same string when there is nothing to strip
+    return value.strip()
+
+
+def clean_value(value: str) -> str:
+    """Remove control characters, literal \\u0000 escapes and surrounding whitespace"""
+    value = strip_control(value)
+    if '\\u0000' in value:
+        value = value.replace('\\u0000', '').strip()
+    return value
+
 
 def sanitize_string(value: str) -> str:
     """
@@ -22,14 +53,17 @@ def sanitize_string(value: str) -> str:
     if not isinstance(value, str):
         return value
     
+    # Fast path: printable, no escapes and no surrounding whitespace
+    if value.isprintable() and '\\u' not in value and value == value.strip():
+        return value
+    
     # Remove null bytes and control characters
-    sanitized = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', value)
+    sanitized = value.translate(_CONTROL_TABLE)
     
-    # Remove Unicode escape sequences
-    sanitized = re.sub(r'\\u0000', '', sanitized)
-    sanitized = re.sub(r'\\u[0-9a-fA-F]{4}', '', sanitized)  # Remove all Unicode escapes
+    # Remove Unicode escape sequences; the substring test skips the regex in the usual case
+    if '\\u' in sanitized:
+        sanitized = _UNICODE_ESCAPE_RE.sub('', sanitized)
     
-    # Remove any remaining problematic characters
     sanitized = sanitized.strip()
     
     if sanitized != value:
@@ -148,21 +182,43 @@ def sanitize_environment_variables() -> int:
     """
     import os
     
-    cleaned_count = 0
-    env_vars = dict(os.environ)
+    # Collect changes while iterating and apply them afterwards, without copying the environment
+    changes = {}
+    for key, value in os.environ.items():
+        sanitized_value = sanitize_string(value)
+        if sanitized_value != value:
+            changes[key] = sanitized_value
+            logger.warning(f"Sanitized environment variable {key}: removed problematic characters")
     
-    for key, value in env_vars.items():
-        if isinstance(value, str):
-            sanitized_value = sanitize_string(value)
-            if sanitized_value != value:
-                os.environ[key] = sanitized_value
-                cleaned_count += 1
-                logger.warning(f"Sanitized environment variable {key}: removed problematic characters")
+    os.environ.update(changes)
+    cleaned_count = len(changes)
     
     logger.info(f"Sanitized {cleaned_count} environment variables")
     return cleaned_count
 
 
+def sanitize_startup_environment() -> int:
+    """
+    Sanitize all environment variables and DATABASE_URL once per process chain
+    
+    Returns:
+        Number of environment variables that were sanitized, 0 if already done
+    """
+    import os
+    
+    if os.environ.get(SANITIZED_FLAG) == '1':
+        logger.info("Environment variables already sanitized")
+        return 0
+    
+    cleaned_count = sanitize_environment_variables()
+    
+    if 'DATABASE_URL' in os.environ:
+        os.environ['DATABASE_URL'] = sanitize_database_url(os.environ['DATABASE_URL'])
+    
+    os.environ[SANITIZED_FLAG] = '1'
+    return cleaned_count
+
+
 def sanitize_before_database_save(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Sanitize data before saving to database to prevent Prisma errors
@@ -7,8 +7,11 @@ import os
 import sys
 import subprocess
 import argparse
-import json
+import hashlib
 import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import distributions
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Dict, Any, List
 
@@ -27,6 +30,10 @@ def run_command(command: str, check: bool = True) -> subprocess.CompletedProcess
     
     return result
 
+def run_batch(commands: List[str], check: bool = True) -> subprocess.CompletedProcess:
+    """Run dependent shell commands in a single shell invocation, stopping at the first failure"""
+    return run_command(" && ".join(commands), check=check)
+
 def check_python_version():
     """Check Python version compatibility"""
     version = sys.version_info
@@ -34,25 +41,71 @@ def check_python_version():
         raise RuntimeError("Python 3.8+ is required")
     print(f"✅ Python version: {version.major}.{version.minor}.{version.micro}")
 
+DEPS_CACHE_DIR = Path.home() / ".cache" / "scanemon"
+
+# Required distributions (pip name -> import name)
+REQUIRED_PACKAGES = {
+    "fastapi": "fastapi",
+    "uvicorn": "uvicorn",
+    "sqlalchemy": "sqlalchemy",
+    "psycopg2-binary": "psycopg2",
+    "redis": "redis",
+    "torch": "torch",
+    "transformers": "transformers",
+    "psutil": "psutil",
+}
+
+# Normalized distribution names, computed once at import
+_NORMALIZED_PACKAGES = {name.lower().replace("-", "_"): name for name in REQUIRED_PACKAGES}
+_REQUIRED_DISTRIBUTIONS = frozenset(_NORMALIZED_PACKAGES)
+
+
+def _dependencies_cache_marker() -> Path:
+    """Marker file recording a successful dependency check for this requirements/interpreter pair"""
+    requirements_file = Path(__file__).resolve().parent / "requirements.txt"
+    digest = hashlib.sha256()
+    try:
+        digest.update(requirements_file.read_bytes())
+    except OSError:
+        pass
+    digest.update(sys.version.encode())
+    return DEPS_CACHE_DIR / f"deps-{digest.hexdigest()}.ok"
+
 def check_dependencies():
     """Check if required dependencies are available"""
-    required_packages = [
-        "fastapi", "uvicorn", "sqlalchemy", "psycopg2-binary", 
-        "redis", "torch", "transformers", "psutil"
-    ]
+    marker = _dependencies_cache_marker()
+    if marker.exists():
+        print("✅ All required packages are installed (cached)")
+        return True
     
-    missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package.replace("-", "_"))
-        except ImportError:
-            missing_packages.append(package)
+    # Read installed distribution metadata instead of importing each package
+    installed = {
+        dist.metadata["Name"].lower().replace("-", "_")
+        for dist in distributions()
+        if dist.metadata["Name"]
+    }
+    missing_packages = sorted(
+        _NORMALIZED_PACKAGES[name] for name in _REQUIRED_DISTRIBUTIONS.difference(installed)
+    )
+    
+    # Packages without distribution metadata may still be importable; locate
+    # them without executing their module code
+    if missing_packages:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            specs = list(executor.map(find_spec, [REQUIRED_PACKAGES[p] for p in missing_packages]))
+        missing_packages = [p for p, spec in zip(missing_packages, specs) if spec is None]
     
     if missing_packages:
         print(f"❌ Missing packages: {missing_packages}")
         print("Run: pip install -r requirements.txt")
         return False
     
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+    except OSError:
+        pass
+    
     print("✅ All required packages are installed")
     return True
 
@@ -107,8 +160,15 @@ def check_redis_connection():
 def run_migrations():
     """Run database migrations"""
     try:
+        from alembic.config import main as alembic_main
+        
         print("Running database migrations...")
-        run_command("alembic upgrade head")
+        try:
+            alembic_main(argv=["-c", "alembic.ini", "upgrade", "head"])
+        except SystemExit as e:
+            # alembic exits the process on command errors
+            if e.code:
+                raise RuntimeError(f"alembic exited with status {e.code}")
         print("✅ Database migrations completed")
         return True
     except Exception as e:
@@ -118,8 +178,12 @@ def run_migrations():
 def run_tests():
     """Run test suite"""
     try:
+        import pytest
+        
         print("Running tests...")
-        run_command("python -m pytest tests/ -v")
+        exit_code = pytest.main(["tests/", "-v"])
+        if exit_code != 0:
+            raise RuntimeError(f"pytest exited with status {int(exit_code)}")
         print("✅ All tests passed")
         return True
     except Exception as e:
@@ -197,8 +261,10 @@ WantedBy=multi-user.target
         with open(service_file, 'w') as f:
             f.write(service_content)
         
-        run_command("sudo systemctl daemon-reload")
-        run_command("sudo systemctl enable scanemon-api")
+        run_batch([
+            "sudo systemctl daemon-reload",
+            "sudo systemctl enable scanemon-api",
+        ])
         
         print("✅ Systemd service created")
         return True
@@ -245,9 +311,11 @@ def create_nginx_config():
         with open(config_file, 'w') as f:
             f.write(nginx_config)
         
-        run_command("sudo ln -sf /etc/nginx/sites-available/scanemon /etc/nginx/sites-enabled/")
-        run_command("sudo nginx -t")
-        run_command("sudo systemctl reload nginx")
+        run_batch([
+            "sudo ln -sf /etc/nginx/sites-available/scanemon /etc/nginx/sites-enabled/",
+            "sudo nginx -t",
+            "sudo systemctl reload nginx",
+        ])
         
         print("✅ Nginx configuration created")
         return True
@@ -255,22 +323,14 @@ def create_nginx_config():
         print(f"❌ Nginx configuration failed: {e}")
         return False
 
-def generate_deployment_report():
-    """Generate deployment report"""
+def generate_deployment_report(checks: Dict[str, bool]):
+    """Generate deployment report from the results of checks already run"""
+    import orjson
+    
     report = {
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
         "version": "1.0.0",
-        "checks": {
-            "python_version": True,
-            "dependencies": check_dependencies(),
-            "database": check_database_connection(),
-            "redis": check_redis_connection(),
-            "migrations": run_migrations(),
-            "tests": run_tests(),
-            "ml_models": check_ml_models(),
-            "security": validate_security(),
-            "performance": check_performance()
-        }
+        "checks": {"python_version": True, **checks}
     }
     
     # Calculate overall status
@@ -278,8 +338,8 @@ def generate_deployment_report():
     report["status"] = "success" if all_checks else "failed"
     
     # Save report
-    with open("deployment_report.json", "w") as f:
-        json.dump(report, f, indent=2)
+    with open("deployment_report.json", "wb") as f:
+        f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
     
     print(f"\n📊 Deployment Report:")
     print(f"  Status: {report['status']}")
@@ -291,7 +351,7 @@ def generate_deployment_report():
 def main():
     """Main deployment function"""
     parser = argparse.ArgumentParser(description="Scanémon API Deployment Script")
-    parser.add_argument("--check-only", action="store_true", help="Only run checks, don't deploy")
+    parser.add_argument("--check-only", action="store_true", help="Only run checks, don't migrate, test or deploy")
     parser.add_argument("--create-service", action="store_true", help="Create systemd service")
     parser.add_argument("--create-nginx", action="store_true", help="Create nginx configuration")
     parser.add_argument("--skip-tests", action="store_true", help="Skip test execution")
@@ -306,40 +366,51 @@ def main():
         check_python_version()
         setup_environment()
         
+        checks: Dict[str, bool] = {}
+        
         # Dependency checks
-        if not check_dependencies():
+        checks["dependencies"] = check_dependencies()
+        if not checks["dependencies"]:
             sys.exit(1)
         
         # Service checks
-        if not check_database_connection():
+        checks["database"] = check_database_connection()
+        if not checks["database"]:
             print("⚠️  Database connection failed - continuing with checks")
         
-        if not check_redis_connection():
+        checks["redis"] = check_redis_connection()
+        if not checks["redis"]:
             print("⚠️  Redis connection failed - continuing with checks")
         
-        # Run migrations
-        if not run_migrations():
-            print("⚠️  Database migrations failed")
+        # Run migrations (alembic is only imported when they actually run)
+        if not args.check_only:
+            checks["migrations"] = run_migrations()
+            if not checks["migrations"]:
+                print("⚠️  Database migrations failed")
         
-        # Run tests (unless skipped)
-        if not args.skip_tests:
-            if not run_tests():
+        # Run tests (unless skipped; pytest is not imported in check-only mode)
+        if not (args.check_only or args.skip_tests):
+            checks["tests"] = run_tests()
+            if not checks["tests"]:
                 print("⚠️  Tests failed")
         
         # ML model check
-        if not check_ml_models():
+        checks["ml_models"] = check_ml_models()
+        if not checks["ml_models"]:
             print("⚠️  ML models not initialized")
         
         # Security validation
-        if not validate_security():
+        checks["security"] = validate_security()
+        if not checks["security"]:
             print("⚠️  Security validation failed")
         
         # Performance check
-        if not check_performance():
+        checks["performance"] = check_performance()
+        if not checks["performance"]:
             print("⚠️  Performance check failed")
         
         # Generate report
-        report = generate_deployment_report()
+        report = generate_deployment_report(checks)
         
         if args.check_only:
             print("\n✅ Check-only mode completed")
@@ -1,102 +1,12 @@
 """
 Scanémon API - Simple Main Application Entry Point for Railway
-"""
-
-import os
-from contextlib import asynccontextmanager
-from typing import Dict, Any
-from datetime import datetime
-
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
-
-# Simple settings without external dependencies
-class Settings:
-    API_HOST = os.getenv("API_HOST", "0.0.0.0")
-    API_PORT = int(os.getenv("API_PORT", "8000"))
-    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
-    ENABLE_SWAGGER = True
-    ENABLE_CORS = True
-    CORS_ORIGINS = ["*"]  # Allow all origins for now
-
-settings = Settings()
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan events"""
-    print("Starting Scanémon API...")
-    yield
-    print("Shutting down Scanémon API...")
-
-def create_app() -> FastAPI:
-    """Create and configure the FastAPI application"""
-    
-    app = FastAPI(
-        title="Scanémon API",
-        description="AI-powered Pokémon card scanner and collector API",
-        version="1.0.0",
-        docs_url="/docs",
-        redoc_url="/redoc",
-        lifespan=lifespan
-    )
-    
-    # Add CORS middleware
-    if settings.ENABLE_CORS:
-        app.add_middleware(
-            CORSMiddleware,
-            allow_origins=settings.CORS_ORIGINS,
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
-    
-    return app
-
-app = create_app()
-
-@app.get("/")
-async def root() -> Dict[str, Any]:
-    """Root endpoint with API information"""
-    return {
-        "message": "Welcome to Scanémon API! 🎴",
-        "version": "1.0.0",
-        "status": "running",
-        "docs": "/docs",
-        "health": "/health"
-    }
-
-@app.get("/health")
-async def health_check() -> Dict[str, Any]:
-    """Simple health check endpoint for Railway"""
-    return {
-        "status": "healthy",
-        "version": "1.0.0",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "message": "Scanémon API is running"
-    }
+Always serves the minimal profile, whatever SCANEMON_PROFILE says.
+"""
 
-@app.exception_handler(HTTPException)
-async def http_exception_handler(request, exc: HTTPException):
-    """Handle HTTP exceptions"""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
+from app.factory import create_app, run
 
-@app.exception_handler(Exception)
-async def general_exception_handler(request, exc: Exception):
-    """Handle general exceptions"""
-    return JSONResponse(
-        status_code=500,
-        content={"detail": "Internal server error"}
-    )
+app = create_app("minimal")
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "main_simple:app",
-        host=settings.API_HOST,
-        port=settings.API_PORT,
-        reload=settings.DEBUG
-    ) 
\ No newline at end of file
+    run("main_simple:app", profile="minimal")
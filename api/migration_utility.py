@@ -2,16 +2,108 @@
 Migration utility for transitioning from SQLite to PostgreSQL
 """
 
+import io
 import sqlite3
-import json
 import logging
+import shutil
+import itertools
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional
 from datetime import datetime
 import os
 
 logger = logging.getLogger(__name__)
 
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Buffer size for export and script files; fewer, larger writes on big exports
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Connection tuning for bulk sequential reads: 256 MiB page cache,
+# in-memory temp storage and a memory-mapped database file
+SQLITE_READ_PRAGMAS = (
+    "PRAGMA cache_size = -262144",
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA mmap_size = {1 << 30}",
+)
+
+# Rows per multi-row INSERT statement in the INSERT script format
+INSERT_BATCH_SIZE = 500
+
+# Escapes for PostgreSQL COPY text format
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+@contextmanager
+def open_output(path: str, text: bool = False) -> Iterator[Any]:
+    """Open an output file for writing, zstd-compressed when the path ends in .zst"""
+    with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as raw:
+        writer = raw
+        if path.endswith(".zst"):
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to write .zst files")
+            writer = zstd.ZstdCompressor(level=3, threads=-1).stream_writer(raw)
+        if text:
+            writer = io.TextIOWrapper(writer, encoding='utf-8', newline='')
+        with writer:
+            yield writer
+
+@contextmanager
+def open_input(path: str) -> Iterator[Any]:
+    """Open a binary input file, decompressing zstd when the path ends in .zst"""
+    with open(path, 'rb') as raw:
+        if not path.endswith(".zst"):
+            yield raw
+            return
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is required to read .zst files")
+        with zstd.ZstdDecompressor().stream_reader(raw) as reader:
+            yield reader
+
+def copy_value(value: Any) -> str:
+    """Encode a value as a PostgreSQL COPY text-format field"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bytes):
+        return "\\\\x" + value.hex()
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+    return str(value)
+
+def sql_literal(value: Any) -> str:
+    """Encode a value as a standard-conforming SQL literal for an INSERT statement
+    
+    Only single quotes are doubled; backslashes are literal under
+    standard_conforming_strings, the default since PostgreSQL 9.1.
+    """
+    if value is None:
+        return "NULL"
+    elif isinstance(value, str):
+        # Escape single quotes
+        escaped_value = value.replace("'", "''")
+        return f"'{escaped_value}'"
+    elif isinstance(value, bytes):
+        # bytea hex format
+        return f"'\\x{value.hex()}'::bytea"
+    elif isinstance(value, bool):
+        return "true" if value else "false"
+    else:
+        return str(value)
+
+def encode_copy_row(row: tuple) -> str:
+    """Encode a row as one COPY text-format line"""
+    return "\t".join(map(copy_value, row)) + "\n"
+
+def encode_values_row(row: tuple) -> str:
+    """Encode a row as one parenthesised VALUES tuple"""
+    return "(" + ", ".join(map(sql_literal, row)) + ")"
+
 class MigrationUtility:
     """Utility for migrating data from SQLite to PostgreSQL"""
     
@@ -21,35 +113,43 @@ class MigrationUtility:
         self.sqlite_conn = None
         
     def connect_sqlite(self):
-        """Connect to SQLite database"""
+        """Connect to the SQLite database read-only"""
         try:
-            self.sqlite_conn = sqlite3.connect(self.sqlite_path)
-            self.sqlite_conn.row_factory = sqlite3.Row
+            # Plain tuple rows; dicts are built from the cursor description
+            self.sqlite_conn = self.connect_sqlite_readonly()
             logger.info(f"Connected to SQLite database: {self.sqlite_path}")
             return True
         except Exception as e:
             logger.error(f"Failed to connect to SQLite: {e}")
             return False
     
-    def get_table_schema(self, table_name: str) -> Dict[str, Any]:
+    def connect_sqlite_readonly(self) -> sqlite3.Connection:
+        """Open a read-only connection tuned for full-table scans, usable from a worker thread"""
+        uri = Path(self.sqlite_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        for pragma in SQLITE_READ_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def get_table_schema(self, table_name: str, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
         """Get table schema from SQLite"""
         try:
-            cursor = self.sqlite_conn.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
+            cursor = (conn or self.sqlite_conn).cursor()
+            columns = cursor.execute(f"PRAGMA table_info({table_name})")
             
             schema = {
                 "table_name": table_name,
                 "columns": []
             }
             
-            for col in columns:
+            # PRAGMA table_info rows: (cid, name, type, notnull, dflt_value, pk)
+            for _, name, col_type, not_null, default, primary_key in columns:
                 schema["columns"].append({
-                    "name": col["name"],
-                    "type": col["type"],
-                    "not_null": bool(col["notnull"]),
-                    "primary_key": bool(col["pk"]),
-                    "default": col["dflt_value"]
+                    "name": name,
+                    "type": col_type,
+                    "not_null": bool(not_null),
+                    "primary_key": bool(primary_key),
+                    "default": default
                 })
             
             return schema
@@ -57,28 +157,40 @@ class MigrationUtility:
             logger.error(f"Failed to get schema for {table_name}: {e}")
             return {}
     
+    def get_table_names(self, conn: Optional[sqlite3.Connection] = None) -> List[str]:
+        """Get user table names, skipping SQLite system tables"""
+        cursor = (conn or self.sqlite_conn).cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        return [row[0] for row in cursor if not row[0].startswith('sqlite_')]
+    
+    def fetch_table_rows(self, table_name: str, chunk: int = 10_000,
+                         conn: Optional[sqlite3.Connection] = None):
+        """Get a table's column names and an iterator over its row tuples, fetched `chunk` rows at a time"""
+        cursor = (conn or self.sqlite_conn).cursor()
+        cursor.arraysize = chunk
+        cursor.execute(f"SELECT * FROM {table_name}")
+        columns = [description[0] for description in cursor.description]
+        
+        def rows() -> Iterator[tuple]:
+            while True:
+                batch = cursor.fetchmany(chunk)
+                if not batch:
+                    break
+                yield from batch
+        
+        return columns, rows()
+    
+    def iter_table_rows(self, table_name: str, chunk: int = 10_000,
+                        conn: Optional[sqlite3.Connection] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over the rows of a table as dicts, fetching `chunk` rows at a time"""
+        columns, rows = self.fetch_table_rows(table_name, chunk, conn)
+        for row in rows:
+            yield dict(zip(columns, row))
+    
     def get_table_data(self, table_name: str) -> List[Dict[str, Any]]:
         """Get all data from a table"""
         try:
-            cursor = self.sqlite_conn.cursor()
-            cursor.execute(f"SELECT * FROM {table_name}")
-            rows = cursor.fetchall()
-            
-            data = []
-            for row in rows:
-                # Convert sqlite3.Row to dict
-                row_dict = dict(row)
-                
-                # Handle datetime conversion
-                for key, value in row_dict.items():
-                    if isinstance(value, str) and key.endswith('_at'):
-                        try:
-                            # Try to parse as datetime
-                            datetime.fromisoformat(value.replace('Z', '+00:00'))
-                        except:
-                            pass
-                
-                data.append(row_dict)
+            data = list(self.iter_table_rows(table_name))
             
             logger.info(f"Exported {len(data)} rows from {table_name}")
             return data
@@ -86,39 +198,59 @@ class MigrationUtility:
             logger.error(f"Failed to get data from {table_name}: {e}")
             return []
     
-    def export_all_data(self) -> bool:
-        """Export all data from SQLite to JSON"""
+    def export_table(self, table_name: str, part_path: str) -> int:
+        """Write one table's entry of the export document to part_path on its own connection"""
+        conn = self.connect_sqlite_readonly()
+        try:
+            with open(part_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                schema = self.get_table_schema(table_name, conn)
+                f.write(orjson.dumps(table_name) + b': {"schema": ' + orjson.dumps(schema) + b', "data": [')
+                
+                # One row per line, so only a single row is held in memory at a time
+                row_count = 0
+                for row in self.iter_table_rows(table_name, conn=conn):
+                    f.write(b'\n' if row_count == 0 else b',\n')
+                    f.write(orjson.dumps(row, default=str))
+                    row_count += 1
+                
+                f.write(b'\n], "row_count": ' + str(row_count).encode() + b'}')
+            
+            return row_count
+        finally:
+            conn.close()
+    
+    def export_all_data(self, max_workers: int = 4) -> bool:
+        """Export all data from SQLite to JSON, one table per worker thread"""
+        part_paths: Dict[str, str] = {}
         try:
             if not self.connect_sqlite():
                 return False
             
-            # Get list of tables
-            cursor = self.sqlite_conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row["name"] for row in cursor.fetchall()]
+            tables = self.get_table_names()
+            part_paths = {table: f"{self.export_path}.{table}.part" for table in tables}
             
-            export_data = {
-                "export_timestamp": datetime.utcnow().isoformat(),
-                "source_database": self.sqlite_path,
-                "tables": {}
-            }
+            # Export each table to its own part file in parallel
+            if tables:
+                with ThreadPoolExecutor(max_workers=min(len(tables), max_workers)) as executor:
+                    futures = {
+                        executor.submit(self.export_table, table, part_paths[table]): table
+                        for table in tables
+                    }
+                    for future in as_completed(futures):
+                        logger.info(f"Exported {future.result()} rows from {futures[future]}")
             
-            for table in tables:
-                if table.startswith('sqlite_'):
-                    continue  # Skip SQLite system tables
+            # Stitch the parts together in table order
+            with open_output(self.export_path) as f:
+                f.write(b'{"export_timestamp": ' + orjson.dumps(datetime.utcnow().isoformat()))
+                f.write(b', "source_database": ' + orjson.dumps(self.sqlite_path))
+                f.write(b', "tables": {')
                 
-                schema = self.get_table_schema(table)
-                data = self.get_table_data(table)
+                for index, table in enumerate(tables):
+                    f.write(b'\n' if index == 0 else b',\n')
+                    with open(part_paths[table], 'rb') as part:
+                        shutil.copyfileobj(part, f, WRITE_BUFFER_SIZE)
                 
-                export_data["tables"][table] = {
-                    "schema": schema,
-                    "data": data,
-                    "row_count": len(data)
-                }
-            
-            # Save to JSON file
-            with open(self.export_path, 'w') as f:
-                json.dump(export_data, f, indent=2, default=str)
+                f.write(b'\n}}\n')
             
             logger.info(f"Exported data to {self.export_path}")
             return True
@@ -129,12 +261,35 @@ class MigrationUtility:
         finally:
             if self.sqlite_conn:
                 self.sqlite_conn.close()
+            for part_path in part_paths.values():
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+    
+    def export_sql_dump(self, dump_path: str) -> bool:
+        """Export the SQLite database as a SQL dump using SQLite's native iterdump"""
+        try:
+            if not self.connect_sqlite():
+                return False
+            
+            with open_output(dump_path, text=True) as f:
+                for statement in self.sqlite_conn.iterdump():
+                    f.write(statement + "\n")
+            
+            logger.info(f"Exported SQL dump to {dump_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to export SQL dump: {e}")
+            return False
+        finally:
+            if self.sqlite_conn:
+                self.sqlite_conn.close()
     
     def validate_export(self) -> Dict[str, Any]:
         """Validate exported data"""
         try:
-            with open(self.export_path, 'r') as f:
-                data = json.load(f)
+            with open_input(self.export_path) as f:
+                data = orjson.loads(f.read())
             
             validation = {
                 "export_file": self.export_path,
@@ -159,67 +314,57 @@ class MigrationUtility:
             logger.error(f"Failed to validate export: {e}")
             return {}
     
-    def create_migration_script(self, target_db_url: str) -> str:
-        """Create SQL migration script for PostgreSQL"""
+    def create_migration_script(self, target_db_url: str, script_format: str = "copy",
+                                script_path: str = "migration_script.sql",
+                                disable_triggers: bool = False) -> str:
+        """Create SQL migration script for PostgreSQL
+        
+        Rows are read straight from SQLite and written as they are fetched,
+        as COPY ... FROM STDIN blocks (default) or as multi-row INSERT statements.
+        disable_triggers skips FK triggers during the load via
+        session_replication_role, which requires a superuser on the target.
+        """
         try:
-            with open(self.export_path, 'r') as f:
-                data = json.load(f)
-            
-            script_lines = [
-                "-- Migration script generated by MigrationUtility",
-                f"-- Generated: {datetime.utcnow().isoformat()}",
-                f"-- Target: {target_db_url}",
-                "",
-                "BEGIN;",
-                ""
-            ]
+            if not self.connect_sqlite():
+                return ""
             
-            for table_name, table_data in data.get("tables", {}).items():
-                schema = table_data.get("schema", {})
-                table_data_list = table_data.get("data", [])
-                
-                if not table_data_list:
-                    continue
+            with open_output(script_path, text=True) as f:
+                f.write("-- Migration script generated by MigrationUtility\n")
+                f.write(f"-- Generated: {datetime.utcnow().isoformat()}\n")
+                f.write(f"-- Target: {target_db_url}\n")
+                f.write("\nBEGIN;\n")
+                # sql_literal leaves backslashes unescaped
+                f.write("SET LOCAL standard_conforming_strings = on;\n")
+                if disable_triggers:
+                    # Skip FK triggers while loading; SET LOCAL reverts at COMMIT
+                    f.write("SET LOCAL session_replication_role = replica;\n")
+                f.write("\n")
                 
-                # Create INSERT statements
-                if table_data_list:
-                    columns = list(table_data_list[0].keys())
-                    script_lines.append(f"-- Inserting {len(table_data_list)} rows into {table_name}")
+                for table_name in self.get_table_names():
+                    columns, rows = self.fetch_table_rows(table_name)
+                    first_row = next(rows, None)
+                    if first_row is None:
+                        continue
                     
-                    for row in table_data_list:
-                        values = []
-                        for col in columns:
-                            value = row.get(col)
-                            if value is None:
-                                values.append("NULL")
-                            elif isinstance(value, str):
-                                # Escape single quotes
-                                escaped_value = value.replace("'", "''")
-                                values.append(f"'{escaped_value}'")
-                            elif isinstance(value, bool):
-                                values.append("true" if value else "false")
-                            else:
-                                values.append(str(value))
-                        
-                        script_lines.append(
-                            f"INSERT INTO {table_name} ({', '.join(columns)}) "
-                            f"VALUES ({', '.join(values)});"
-                        )
+                    column_list = ', '.join(columns)
+                    f.write(f"-- Loading rows into {table_name}\n")
                     
-                    script_lines.append("")
-            
-            script_lines.extend([
-                "COMMIT;",
-                "",
-                "-- Migration completed successfully"
-            ])
-            
-            script_content = "\n".join(script_lines)
-            
-            # Save script
-            script_path = "migration_script.sql"
-            with open(script_path, 'w') as f:
-                f.write(script_content)
+                    rows = itertools.chain((first_row,), rows)
+                    
+                    # Lines are generated lazily so memory stays at one fetch chunk
+                    if script_format == "copy":
+                        f.write(f"COPY {table_name} ({column_list}) FROM STDIN;\n")
+                        f.writelines(map(encode_copy_row, rows))
+                        f.write("\\.\n")
+                    else:
+                        # One multi-row INSERT per batch of rows
+                        insert_prefix = f"INSERT INTO {table_name} ({column_list}) VALUES\n  "
+                        while batch := list(itertools.islice(rows, INSERT_BATCH_SIZE)):
+                            f.write(insert_prefix + ",\n  ".join(map(encode_values_row, batch)) + ";\n")
+                    
+                    f.write("\n")
+                
+                f.write("COMMIT;\n\n-- Migration completed successfully")
             
             logger.info(f"Migration script created: {script_path}")
             return script_path
@@ -227,6 +372,9 @@ class MigrationUtility:
         except Exception as e:
             logger.error(f"Failed to create migration script: {e}")
             return ""
+        finally:
+            if self.sqlite_conn:
+                self.sqlite_conn.close()
     
     def backup_sqlite(self) -> str:
         """Create a backup of the SQLite database"""
@@ -234,8 +382,20 @@ class MigrationUtility:
             backup_path = f"{self.sqlite_path}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             
             if os.path.exists(self.sqlite_path):
-                import shutil
-                shutil.copy2(self.sqlite_path, backup_path)
+                # Online backup API: a consistent copy even while the database is in use
+                source = self.connect_sqlite_readonly()
+                dest = sqlite3.connect(backup_path)
+                try:
+                    source.backup(
+                        dest,
+                        pages=1000,
+                        progress=lambda status, remaining, total: logger.info(
+                            f"Backup progress: {total - remaining}/{total} pages"
+                        )
+                    )
+                finally:
+                    dest.close()
+                    source.close()
                 logger.info(f"SQLite backup created: {backup_path}")
                 return backup_path
             else:
@@ -247,15 +407,25 @@ class MigrationUtility:
             return ""
 
 def main():
-    """Main migration utility"""
+    """Main migration utility
+    
+    Export, dump and script paths ending in .zst are written zstd-compressed.
+    """
     import argparse
     
     parser = argparse.ArgumentParser(description="SQLite to PostgreSQL Migration Utility")
     parser.add_argument("--sqlite-path", default="scanemon.db", help="Path to SQLite database")
     parser.add_argument("--export-path", default="migration_data.json", help="Path for exported data")
-    parser.add_argument("--action", choices=["export", "validate", "backup", "script"], 
+    parser.add_argument("--dump-path", default="migration_dump.sql", help="Path for the SQL dump")
+    parser.add_argument("--action", choices=["export", "dump", "validate", "backup", "script"], 
                        default="export", help="Action to perform")
     parser.add_argument("--target-db", help="Target PostgreSQL database URL")
+    parser.add_argument("--script-path", default="migration_script.sql",
+                       help="Path for the migration script")
+    parser.add_argument("--script-format", choices=["copy", "insert"], default="copy",
+                       help="Load rows with COPY blocks or INSERT statements")
+    parser.add_argument("--disable-triggers", action="store_true",
+                       help="Skip FK triggers while loading (requires a superuser on the target)")
     
     args = parser.parse_args()
     
@@ -274,6 +444,12 @@ def main():
         else:
             print("❌ Export failed")
     
+    elif args.action == "dump":
+        if utility.export_sql_dump(args.dump_path):
+            print(f"✅ SQL dump exported to: {args.dump_path}")
+        else:
+            print("❌ SQL dump failed")
+    
     elif args.action == "validate":
         validation = utility.validate_export()
         if validation:
@@ -290,7 +466,8 @@ def main():
             print("❌ Target database URL required for script generation")
             return
         
-        script_path = utility.create_migration_script(args.target_db)
+        script_path = utility.create_migration_script(args.target_db, args.script_format, args.script_path,
+                                                      args.disable_triggers)
         if script_path:
             print(f"✅ Migration script created: {script_path}")
         else:
@@ -5,25 +5,18 @@ Railway Bypass Script - Attempts to bypass Railway's internal Prisma system
 
 import os
 import sys
-import re
-import subprocess
-import time
 
 # Import our comprehensive data sanitization utility
-from app.utils.data_sanitizer import (
-    sanitize_environment_variables,
-    sanitize_database_url,
-    sanitize_for_railway
-)
+from app.utils.data_sanitizer import sanitize_startup_environment
 
-def setup_clean_environment():
-    """Set up a clean environment for Railway"""
+def setup_clean_environment(env):
+    """Set up a clean environment for Railway, applying defaults missing from the env snapshot"""
     print("⚙️ Setting up clean Railway environment...")
     
     # Set clean defaults
     defaults = {
         'API_HOST': '0.0.0.0',
-        'API_PORT': os.getenv('PORT', '8000'),
+        'API_PORT': env.get('PORT', '8000'),
         'DEBUG': 'False',
         'ENVIRONMENT': 'production',
         'ENABLE_CORS': 'True',
@@ -38,39 +31,34 @@ def setup_clean_environment():
         'LOG_LEVEL': 'INFO'
     }
     
-    for key, value in defaults.items():
-        if key not in os.environ:
-            os.environ[key] = value
-            print(f"Set default {key}={value}")
+    missing = {key: value for key, value in defaults.items() if key not in env}
+    for key, value in missing.items():
+        print(f"Set default {key}={value}")
+    
+    # Single write-back instead of one lookup and setenv per default
+    env.update(missing)
+    os.environ.update(missing)
 
 def main():
     """Main function with comprehensive data sanitization"""
     print("🚀 RAILWAY BYPASS: Starting deployment with comprehensive sanitization...")
     
     try:
-        # Step 1: Comprehensive environment sanitization
+        # Step 1: Comprehensive environment sanitization, including the database URL
         print("🧹 Step 1: Sanitizing environment variables...")
-        cleaned_count = sanitize_environment_variables()
-        
-        # Step 2: Fix database URL specifically
-        print("🔧 Step 2: Fixing database URL...")
-        if 'DATABASE_URL' in os.environ:
-            os.environ['DATABASE_URL'] = sanitize_database_url(os.environ['DATABASE_URL'])
+        cleaned_count = sanitize_startup_environment()
         
-        # Step 3: Set up clean environment
-        print("⚙️ Step 3: Setting up clean environment...")
-        setup_clean_environment()
+        # Step 2: Set up clean environment
+        print("⚙️ Step 2: Setting up clean environment...")
+        env = dict(os.environ)
+        setup_clean_environment(env)
         
         if cleaned_count > 0:
             print(f"⚠️  WARNING: {cleaned_count} environment variables contained problematic characters")
             print("This should prevent Railway's internal Prisma errors")
         
-        # Step 4: Wait a moment for Railway's systems to settle
-        print("⏳ Step 4: Waiting for Railway's internal systems to settle...")
-        time.sleep(2)
-        
-        # Step 5: Start the application
-        print("🚀 Step 5: Starting main application...")
+        # Step 3: Start the application
+        print("🚀 Step 3: Starting main application...")
         
         # Import and start the application
         from main import create_app
@@ -79,8 +67,8 @@ def main():
         app = create_app()
         
         # Get port from environment
-        port = int(os.getenv('PORT', 8000))
-        host = os.getenv('API_HOST', '0.0.0.0')
+        port = int(env.get('PORT', 8000))
+        host = env['API_HOST']
         
         print(f"🌐 Starting server on {host}:{port}")
         print(f"📊 Health check available at: http://{host}:{port}/health")
@@ -5,11 +5,12 @@ Railway Deployment Fix - Comprehensive solution for Unicode escape sequence erro
 
 import os
 import sys
-import re
 import json
 import logging
 from pathlib import Path
 
+from app.utils.data_sanitizer import sanitize_startup_environment
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,54 +18,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-
-def clean_environment_variables():
-    """Clean all environment variables of null bytes and problematic characters"""
-    logger.info("🧹 Cleaning environment variables...")
-    
-    # Get all environment variables
-    env_vars = dict(os.environ)
-    cleaned_count = 0
-    
-    for key, value in env_vars.items():
-        if isinstance(value, str):
-            # Remove null bytes and control characters
-            cleaned_value = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', value)
-            
-            # Remove Unicode escape sequences
-            cleaned_value = re.sub(r'\\u0000', '', cleaned_value)
-            
-            # Remove any remaining problematic characters
-            cleaned_value = cleaned_value.strip()
-            
-            if cleaned_value != value:
-                os.environ[key] = cleaned_value
-                cleaned_count += 1
-                logger.warning(f"Cleaned {key}: removed problematic characters")
-    
-    logger.info(f"✅ Cleaned {cleaned_count} environment variables")
-    return cleaned_count
-
-
-def fix_database_url():
-    """Fix common Railway database URL issues"""
-    if 'DATABASE_URL' in os.environ:
-        db_url = os.environ['DATABASE_URL']
-        
-        # Fix protocol issues
-        if db_url.startswith('postgres://'):
-            os.environ['DATABASE_URL'] = db_url.replace('postgres://', 'postgresql://', 1)
-            logger.info("Fixed DATABASE_URL protocol from postgres:// to postgresql://")
-        
-        # Remove any null bytes or control characters
-        cleaned_url = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', db_url)
-        cleaned_url = re.sub(r'\\u0000', '', cleaned_url)
-        
-        if cleaned_url != db_url:
-            os.environ['DATABASE_URL'] = cleaned_url
-            logger.warning("Removed problematic characters from DATABASE_URL")
-        
-        logger.info("✅ Database URL cleaned and validated")
+# Variables copied from the environment into .env.railway
+RAILWAY_ENV_PREFIXES = ('DATABASE_URL', 'REDIS_URL', 'SECRET_KEY', 'FIREBASE_', 'SUPABASE_', 'STRIPE_')
 
 
 def create_railway_env_file():
@@ -72,7 +27,7 @@ def create_railway_env_file():
     logger.info("📝 Creating clean Railway environment file...")
     
     # Critical environment variables for Railway
-    railway_env = {
+    defaults = {
         'API_HOST': '0.0.0.0',
         'API_PORT': os.getenv('PORT', '8000'),
         'DEBUG': 'False',
@@ -87,15 +42,14 @@ def create_railway_env_file():
         'DB_POOL_RECYCLE': '3600'
     }
     
-    # Add cleaned environment variables
-    for key, value in os.environ.items():
-        if key.startswith(('DATABASE_URL', 'REDIS_URL', 'SECRET_KEY', 'FIREBASE_', 'SUPABASE_', 'STRIPE_')):
-            railway_env[key] = value
+    # Keep the cleaned secrets in one pass; they override the defaults
+    kept = {key: value for key, value in os.environ.items() if key.startswith(RAILWAY_ENV_PREFIXES)}
+    railway_env = {**defaults, **kept}
     
     # Write to .env file
-    env_content = '\n'.join([f'{key}={value}' for key, value in railway_env.items()])
+    env_content = '\n'.join(f'{key}={value}' for key, value in railway_env.items()).encode('utf-8')
     
-    with open('.env.railway', 'w', encoding='utf-8') as f:
+    with open('.env.railway', 'wb') as f:
         f.write(env_content)
     
     logger.info("✅ Created .env.railway file with clean environment variables")
@@ -112,35 +66,21 @@ Railway Startup Script - Clean and sanitized
 
 import os
 import sys
-import re
 import logging
 
+from app.utils.data_sanitizer import sanitize_startup_environment
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def clean_env():
-    """Clean environment variables"""
-    logger.info("Cleaning environment variables...")
-    
-    for key, value in os.environ.items():
-        if isinstance(value, str):
-            # Remove null bytes and control characters
-            cleaned = re.sub(r'[\\x00-\\x08\\x0B\\x0C\\x0E-\\x1F\\x7F]', '', value)
-            cleaned = re.sub(r'\\\\u0000', '', cleaned)
-            cleaned = cleaned.strip()
-            
-            if cleaned != value:
-                os.environ[key] = cleaned
-                logger.warning(f"Cleaned {key}")
-    
-    logger.info("Environment cleaning completed")
-
 def main():
     """Main startup function"""
     try:
         # Clean environment first
-        clean_env()
+        logger.info("Cleaning environment variables...")
+        sanitize_startup_environment()
+        logger.info("Environment cleaning completed")
         
         # Import and start application
         from main import create_app
@@ -207,6 +147,7 @@ slowapi==0.1.9
 firebase-admin==6.2.0
 supabase==2.0.2
 stripe==7.6.0
+orjson==3.9.10
 gunicorn==21.2.0
 regex==2023.10.3
 '''
@@ -223,22 +164,21 @@ def main():
     logger.info("=" * 40)
     
     try:
-        # Step 1: Clean environment variables
-        cleaned_count = clean_environment_variables()
-        
-        # Step 2: Fix database URL
-        fix_database_url()
+        # Step 1: Clean environment variables and fix database URL
+        logger.info("🧹 Cleaning environment variables...")
+        cleaned_count = sanitize_startup_environment()
+        logger.info(f"✅ Cleaned {cleaned_count} environment variables")
         
-        # Step 3: Create clean environment file
+        # Step 2: Create clean environment file
         create_railway_env_file()
         
-        # Step 4: Create clean startup script
+        # Step 3: Create clean startup script
         create_railway_startup_script()
         
-        # Step 5: Update Railway configuration
+        # Step 4: Update Railway configuration
         update_railway_config()
         
-        # Step 6: Create clean requirements
+        # Step 5: Create clean requirements
         create_railway_requirements()
         
         logger.info("✅ Railway deployment fix completed!")
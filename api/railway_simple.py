@@ -5,33 +5,26 @@ Simplified Railway startup script - focuses on core deployment issues
 
 import os
 import sys
-import re
 import logging
 
+from app.utils.data_sanitizer import clean_value
+
 # CRITICAL: Sanitize environment IMMEDIATELY
 print("🚨 CRITICAL: Sanitizing environment variables immediately...")
 
-# Get all environment variables and sanitize them
-env_vars = dict(os.environ)
-cleaned_count = 0
+# Sanitize all environment variables, collecting changes and applying them after the loop
+updates = {}
 
-for key, value in env_vars.items():
-    if isinstance(value, str):
-        # Remove null bytes and control characters
-        cleaned_value = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', value)
-        
-        # Remove Unicode escape sequences
-        cleaned_value = re.sub(r'\\u0000', '', cleaned_value)
-        
-        # Remove any remaining problematic characters
-        cleaned_value = cleaned_value.strip()
-        
-        if cleaned_value != value:
-            os.environ[key] = cleaned_value
-            cleaned_count += 1
-            print(f"🧹 Cleaned {key}: removed problematic characters")
+for key, value in os.environ.items():
+    # Remove control characters, \u0000 escapes and surrounding whitespace
+    cleaned_value = clean_value(value)
+    
+    if cleaned_value != value:
+        updates[key] = cleaned_value
+        print(f"🧹 Cleaned {key}: removed problematic characters")
 
-print(f"✅ Immediately sanitized {cleaned_count} environment variables")
+os.environ.update(updates)
+print(f"✅ Immediately sanitized {len(updates)} environment variables")
 
 # Fix database URL if needed
 if 'DATABASE_URL' in os.environ:
@@ -74,9 +67,8 @@ def main():
         )
         
     except Exception as e:
-        logger.error(f"❌ Failed to start application: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        # logger.exception formats the traceback only if the record is emitted
+        logger.exception(f"❌ Failed to start application: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
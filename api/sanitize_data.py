@@ -4,54 +4,107 @@ Data sanitization script to remove null bytes and problematic characters
 """
 
 import json
-import re
+import shutil
 import sqlite3
 import os
 from pathlib import Path
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+from app.utils.data_sanitizer import clean_value
+
 
 def sanitize_string(value):
-    """Remove null bytes and problematic characters from a string"""
+    """Remove null bytes and problematic characters from a string
+    
+    Clean strings are returned as the same object, without intermediate copies.
+    """
     if not isinstance(value, str):
         return value
     
-    # Remove null bytes and control characters
-    sanitized = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', value)
-    
-    # Remove Unicode escape sequences
-    sanitized = re.sub(r'\\u0000', '', sanitized)
-    
-    return sanitized.strip()
+    # Remove null bytes, control characters, \u0000 escapes and surrounding whitespace
+    return clean_value(value)
 
 
 def sanitize_json_file(file_path):
-    """Sanitize a JSON file"""
+    """Sanitize a JSON file, streaming it through ijson when available"""
     if not os.path.exists(file_path):
         print(f"File not found: {file_path}")
         return
     
     print(f"Sanitizing {file_path}...")
     
+    tmp_path = f"{file_path}.tmp"
+    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         # Create backup
         backup_path = f"{file_path}.backup"
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        shutil.copy2(file_path, backup_path)
         
-        # Sanitize the data recursively
-        sanitized_data = sanitize_json_recursive(data)
-        
-        # Write sanitized data
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(sanitized_data, f, indent=2, ensure_ascii=False)
+        # Write sanitized data next to the original, then swap it in atomically
+        with open(file_path, 'rb') as src, open(tmp_path, 'w', encoding='utf-8') as dst:
+            streamed = False
+            if IJSON_AVAILABLE:
+                try:
+                    write_sanitized_json_events(ijson.parse(src, use_float=True), dst)
+                    streamed = True
+                except ijson.JSONError:
+                    # yajl rejects integers beyond 64 bits that json.load accepts
+                    src.seek(0)
+                    dst.seek(0)
+                    dst.truncate()
+            if not streamed:
+                json.dump(sanitize_json_recursive(json.load(src)), dst, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, file_path)
         
         print(f"✅ Sanitized {file_path} (backup saved to {backup_path})")
         
     except Exception as e:
         print(f"❌ Error sanitizing {file_path}: {e}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_sanitized_json_events(events, out):
+    """Write ijson parse events as indented JSON, sanitizing string values on the way"""
+    # Per open container: number of items written so far
+    counts = []
+    after_key = False
+    
+    for _, event, value in events:
+        if event in ('end_map', 'end_array'):
+            count = counts.pop()
+            if count:
+                out.write("\n" + "  " * len(counts))
+            out.write("}" if event == 'end_map' else "]")
+            continue
+        
+        # Separator and indentation before a new item (not before a key's value)
+        if after_key:
+            after_key = False
+        elif counts:
+            out.write(("," if counts[-1] else "") + "\n" + "  " * len(counts))
+            counts[-1] += 1
+        
+        if event == 'map_key':
+            out.write(json.dumps(value, ensure_ascii=False) + ": ")
+            after_key = True
+        elif event == 'start_map':
+            out.write("{")
+            counts.append(0)
+        elif event == 'start_array':
+            out.write("[")
+            counts.append(0)
+        elif event == 'string':
+            out.write(json.dumps(sanitize_string(value), ensure_ascii=False))
+        else:
+            # number, boolean or null
+            out.write(json.dumps(value))
 
 
 def sanitize_json_recursive(obj):
@@ -61,6 +114,9 @@ def sanitize_json_recursive(obj):
     elif isinstance(obj, list):
         return [sanitize_json_recursive(item) for item in obj]
     elif isinstance(obj, str):
+        # Fast path for already-clean leaves: isprintable() rejects every control character
+        if obj.isprintable() and '\\u0000' not in obj and obj == obj.strip():
+            return obj
         return sanitize_string(obj)
     else:
         return obj
@@ -76,7 +132,6 @@ def sanitize_sqlite_database(db_path):
     
     # Create backup
     backup_path = f"{db_path}.backup"
-    import shutil
     shutil.copy2(db_path, backup_path)
     print(f"Backup created: {backup_path}")
     
@@ -88,30 +143,29 @@ def sanitize_sqlite_database(db_path):
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
         tables = cursor.fetchall()
         
-        for table in tables:
-            table_name = table[0]
-            print(f"Sanitizing table: {table_name}")
-            
-            # Get table schema
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
-            
-            # Get all data
-            cursor.execute(f"SELECT * FROM {table_name}")
-            rows = cursor.fetchall()
-            
-            # Sanitize each row
-            for row in rows:
-                sanitized_row = []
-                for i, value in enumerate(row):
-                    if isinstance(value, str):
-                        sanitized_value = sanitize_string(value)
-                        if sanitized_value != value:
-                            # Update the value in the database
-                            placeholders = ', '.join(['?' for _ in row])
-                            update_sql = f"UPDATE {table_name} SET {columns[i][1]} = ? WHERE rowid = ?"
-                            cursor.execute(update_sql, (sanitized_value, row[0]))
-                conn.commit()
+        # One transaction for the whole database instead of a commit per row
+        with conn:
+            for (table_name,) in tables:
+                print(f"Sanitizing table: {table_name}")
+                
+                # Changed rows grouped by which columns changed, so each UPDATE is prepared once
+                updates = {}
+                rows = conn.execute(f"SELECT rowid, * FROM {table_name}")
+                column_names = [description[0] for description in rows.description[1:]]
+                
+                for rowid, *values in rows:
+                    changed = {}
+                    for i, value in enumerate(values):
+                        if isinstance(value, str):
+                            sanitized_value = sanitize_string(value)
+                            if sanitized_value != value:
+                                changed[i] = sanitized_value
+                    if changed:
+                        updates.setdefault(tuple(changed), []).append((*changed.values(), rowid))
+                
+                for column_indexes, params in updates.items():
+                    assignments = ', '.join(f"{column_names[i]} = ?" for i in column_indexes)
+                    cursor.executemany(f"UPDATE {table_name} SET {assignments} WHERE rowid = ?", params)
         
         conn.close()
         print(f"✅ Sanitized SQLite database: {db_path}")
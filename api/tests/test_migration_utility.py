@@ -0,0 +1,25 @@
+"""
+Checks for the SQL literals written by migration_utility's INSERT scripts
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from migration_utility import sql_literal
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, "NULL"),
+    (True, "true"),
+    (42, "42"),
+    ("it's", "'it''s'"),
+    ("a\\b", "'a\\b'"),
+    (b"\x00\x01\\", "'\\x00015c'::bytea"),
+    (b"\\", "'\\x5c'::bytea"),
+])
+def test_sql_literal_is_standard_conforming(value, expected):
+    assert sql_literal(value) == expected
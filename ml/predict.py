@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from fastapi import UploadFile
 import random
+import time
 from datetime import datetime
 
 # Hardcoded test set of 10 Pokémon cards as specified in the plan
@@ -17,47 +18,67 @@ HARDCODED_CARDS = [
     {"name": "Magikarp", "set": "Base Set", "rarity": "Common", "type": "Water", "hp": "30"}
 ]
 
+# Case-insensitive name index for get_card_by_name
+_CARD_BY_NAME = {card["name"].casefold(): card for card in HARDCODED_CARDS}
+
+# Constant part of every prediction; per-request fields are overlaid on a copy.
+# Keys are listed in response order, with None placeholders for per-request values.
+_BASE_RESPONSE = {
+    "name": "Pikachu",
+    "set": "Base Set",
+    "rarity": "Common",
+    "type": "Electric",
+    "hp": "40",
+    "confidence": 4.20,  # 420% confidence as specified
+    "timestamp": None,
+    "model_version": "fake_v1.2.0",  # Enhanced version tracking
+    "filename": None,
+    "file_size": None,
+    "file_type": None,
+    "scan_method": "image",
+    "processing_time_ms": None,
+    "model_metadata": {
+        "model_type": "fake_classifier",
+        "model_family": "pokemon_card_detector",
+        "training_data_version": "v1.0",
+        "last_updated": "2024-01-01T00:00:00Z"
+    }
+}
+
+# Response timestamp cached at one-second granularity
+_timestamp_cache = {"sec": 0, "value": ""}
+
+def get_timestamp() -> str:
+    """Get the current UTC timestamp, formatting it at most once per second"""
+    now = int(time.time())
+    if now != _timestamp_cache["sec"]:
+        _timestamp_cache["value"] = datetime.utcfromtimestamp(now).isoformat() + "Z"
+        _timestamp_cache["sec"] = now
+    return _timestamp_cache["value"]
+
 def predict_card(file: UploadFile) -> Dict[str, Any]:
     """
     Fake model: always returns Pikachu with 420% confidence for now.
     Returns structured card data with all metadata for filtering.
     """
-    import time
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     # For MVP: Always return Pikachu with 420% confidence
     # TODO: Replace with real hosted CLIP model later
-    card = {"name": "Pikachu", "set": "Base Set", "rarity": "Common", "type": "Electric", "hp": "40"}
-    confidence = 4.20  # 420% confidence as specified
+    response = _BASE_RESPONSE.copy()
     
     # Calculate processing time
-    processing_time_ms = int((time.time() - start_time) * 1000)
+    processing_time_ms = (time.perf_counter_ns() - start_time) // 1_000_000
     
-    # Get file metadata
-    file_size = getattr(file, 'size', None)
-    file_type = file.content_type.split('/')[-1] if file.content_type else None
+    # Overlay per-request metadata
+    response["timestamp"] = get_timestamp()
+    content_type = file.content_type
+    response["filename"] = file.filename or "unknown.jpg"
+    response["file_size"] = getattr(file, 'size', None)
+    response["file_type"] = content_type.rpartition('/')[2] if content_type else None
+    response["processing_time_ms"] = processing_time_ms
     
-    return {
-        "name": card["name"],
-        "set": card["set"],
-        "rarity": card["rarity"],
-        "type": card["type"],
-        "hp": card["hp"],
-        "confidence": confidence,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "model_version": "fake_v1.2.0",  # Enhanced version tracking
-        "filename": file.filename if file.filename else "unknown.jpg",
-        "file_size": file_size,
-        "file_type": file_type,
-        "scan_method": "image",
-        "processing_time_ms": processing_time_ms,
-        "model_metadata": {
-            "model_type": "fake_classifier",
-            "model_family": "pokemon_card_detector",
-            "training_data_version": "v1.0",
-            "last_updated": "2024-01-01T00:00:00Z"
-        }
-    }
+    return response
 
 def get_all_cards() -> list:
     """Get the complete list of hardcoded cards for reference"""
@@ -65,7 +86,5 @@ def get_all_cards() -> list:
 
 def get_card_by_name(name: str) -> Dict[str, Any]:
     """Get a specific card by name"""
-    for card in HARDCODED_CARDS:
-        if card["name"].lower() == name.lower():
-            return card.copy()
-    return None 
\ No newline at end of file
+    card = _CARD_BY_NAME.get(name.casefold())
+    return card.copy() if card else None 
\ No newline at end of file
@@ -4,17 +4,20 @@ Quick Test Script for Scanémon Stability Improvements
 Run this to quickly verify everything is working
 """
 
-import requests
+import asyncio
+import httpx
 import time
 import json
 from datetime import datetime
 
-def test_endpoint(url, name):
+BASE_URL = "http://localhost:8000"
+
+async def test_endpoint(client, path, name):
     """Test a single endpoint"""
     try:
-        start_time = time.time()
-        response = requests.get(url, timeout=10)
-        duration = time.time() - start_time
+        start_time = time.perf_counter()
+        response = await client.get(path)
+        duration = time.perf_counter() - start_time
         
         if response.status_code == 200:
             print(f"✅ {name} - {duration:.2f}s")
@@ -26,12 +29,12 @@ def test_endpoint(url, name):
         print(f"❌ {name} - Error: {e}")
         return False
 
-def test_scan_endpoint():
+async def test_scan_endpoint(client):
     """Test scan endpoint with graceful degradation"""
     try:
         # Test with invalid data to trigger graceful degradation
         files = {'file': ('test.txt', b'invalid data', 'text/plain')}
-        response = requests.post('http://localhost:8000/api/v1/scan/', files=files, timeout=10)
+        response = await client.post('/api/v1/scan/', files=files)
         
         if response.status_code in [200, 422]:  # Both are acceptable
             data = response.json()
@@ -52,41 +55,37 @@ def test_scan_endpoint():
         print(f"❌ Scan Endpoint - Error: {e}")
         return False
 
-def main():
-    """Run all quick tests"""
-    print("🚀 Quick Test for Scanémon Stability Improvements")
-    print("=" * 60)
-    
+async def run_tests():
+    """Run all endpoint probes concurrently over one client"""
     # Test basic endpoints
     endpoints = [
-        ("http://localhost:8000/", "Root Endpoint"),
-        ("http://localhost:8000/health", "Health Check"),
-        ("http://localhost:8000/api/v1/scan/system-status", "System Status"),
+        ("/", "Root Endpoint"),
+        ("/health", "Health Check"),
+        ("/api/v1/scan/system-status", "System Status"),
     ]
     
-    basic_tests = []
-    for url, name in endpoints:
-        result = test_endpoint(url, name)
-        basic_tests.append(result)
-    
     # Test monitoring endpoints
     monitoring_endpoints = [
-        ("http://localhost:8000/api/v1/monitoring/performance", "Performance Monitoring"),
-        ("http://localhost:8000/api/v1/monitoring/health", "System Health"),
-        ("http://localhost:8000/api/v1/monitoring/alerts", "Alerts"),
-        ("http://localhost:8000/api/v1/monitoring/status", "System Status"),
+        ("/api/v1/monitoring/performance", "Performance Monitoring"),
+        ("/api/v1/monitoring/health", "System Health"),
+        ("/api/v1/monitoring/alerts", "Alerts"),
+        ("/api/v1/monitoring/status", "System Status"),
     ]
     
-    monitoring_tests = []
-    for url, name in monitoring_endpoints:
-        result = test_endpoint(url, name)
-        monitoring_tests.append(result)
-    
-    # Test scan endpoint with graceful degradation
-    scan_test = test_scan_endpoint()
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=10) as client:
+        return await asyncio.gather(
+            *(test_endpoint(client, path, name) for path, name in endpoints + monitoring_endpoints),
+            # Test scan endpoint with graceful degradation
+            test_scan_endpoint(client)
+        )
+
+def main():
+    """Run all quick tests"""
+    print("🚀 Quick Test for Scanémon Stability Improvements")
+    print("=" * 60)
     
     # Calculate results
-    all_tests = basic_tests + monitoring_tests + [scan_test]
+    all_tests = asyncio.run(run_tests())
     total_tests = len(all_tests)
     passed_tests = sum(all_tests)
     
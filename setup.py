@@ -5,15 +5,16 @@ Setup script for Scanémon project
 
 import os
 import sys
+import shutil
 import subprocess
 import platform
 
-def run_command(command, cwd=None):
-    """Run a command and return the result"""
+def run_command(args, cwd=None):
+    """Run a command from an argument list, without a shell, and return its output"""
+    command = " ".join(args)
     try:
         result = subprocess.run(
-            command, 
-            shell=True, 
+            args, 
             cwd=cwd, 
             capture_output=True, 
             text=True, 
@@ -25,6 +26,10 @@ def run_command(command, cwd=None):
         print(f"❌ {command}")
         print(f"Error: {e.stderr}")
         return None
+    except FileNotFoundError as e:
+        print(f"❌ {command}")
+        print(f"Error: {e}")
+        return None
 
 def check_python_version():
     """Check if Python version is compatible"""
@@ -35,8 +40,9 @@ def check_python_version():
 
 def check_node_version():
     """Check if Node.js is installed"""
-    result = subprocess.run("node --version", shell=True, capture_output=True, text=True)
-    if result.returncode != 0:
+    node = shutil.which("node")
+    result = node and subprocess.run([node, "--version"], capture_output=True, text=True)
+    if not result or result.returncode != 0:
         print("❌ Node.js is not installed")
         print("Please install Node.js from https://nodejs.org/")
         sys.exit(1)
@@ -47,7 +53,7 @@ def setup_backend():
     print("\n🔧 Setting up backend...")
     
     # Install Python dependencies
-    if not run_command("pip install -r requirements.txt", cwd="api"):
+    if not run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], cwd="api"):
         print("Failed to install Python dependencies")
         return False
     
@@ -56,7 +62,7 @@ def setup_backend():
     if not os.path.exists(env_file):
         example_env = os.path.join("api", "env.example")
         if os.path.exists(example_env):
-            run_command(f"copy {example_env} {env_file}")
+            shutil.copyfile(example_env, env_file)
             print("✅ Created .env file from template")
     
     return True
@@ -66,7 +72,8 @@ def setup_frontend():
     print("\n🔧 Setting up frontend...")
     
     # Install Node.js dependencies
-    if not run_command("npm install", cwd="app"):
+    # npm is a .cmd script on Windows, so resolve its full path
+    if not run_command([shutil.which("npm") or "npm", "install"], cwd="app"):
         print("Failed to install Node.js dependencies")
         return False
     